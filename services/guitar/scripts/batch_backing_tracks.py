@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Batch Backing Track Renderer
+
+Renders a library of backing tracks from a config matrix in parallel:
+1. Expand the matrix (e.g. keys x styles x tempos) over shared base options
+2. Skip jobs whose config fingerprint matches the existing manifest
+3. Render the remaining jobs on a process pool (filter banks designed once
+   per style per worker, pluck cache shared across a worker's jobs)
+4. Write manifest.json with the generate_backing_track results of every job
+   (including per-stage timings and bytes written per file; --profile-dir
+   adds a cProfile per job). A job that fails keeps its last good results
+   alongside the error, so their files stay listed
+
+Every job renders with the matrix seed (BackingTrackConfig.seed), so a
+rerun of the same matrix reproduces bit-identical audio, whatever the
+worker count, and only changed jobs are rendered.
+
+Matrix file (JSON, or YAML when PyYAML is installed):
+    {
+      "output_dir": "library",
+      "seed": 42,
+      "base": {"bars": 8, "include_bass": true, "output_format": "flac"},
+      "matrix": {
+        "key": ["C", "C#", "D", "D#", "E", "F",
+                "F#", "G", "G#", "A", "A#", "B"],
+        "style": ["rock", "blues", "metal", "metal_reference",
+                  "punk", "grunge", "djent"],
+        "bpm": [90, 120, 150]
+      }
+    }
+
+Usage:
+    python batch_backing_tracks.py library.json --workers 8
+"""
+
+import contextlib
+import io
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Iterable, List
+
+import neural_backing_track as nbt
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+MANIFEST_NAME = "manifest.json"
+
+
+def load_matrix(path: str) -> dict:
+    """Load a batch matrix from JSON or YAML"""
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix in ('.yaml', '.yml'):
+            if not HAS_YAML:
+                raise SystemExit("PyYAML not available, use a JSON matrix")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def expand_jobs(matrix: dict, output_dir: Path) -> List[dict]:
+    """Expand the matrix into one job per combination of values"""
+    base = matrix.get('base', {})
+    axes = matrix.get('matrix', {})
+    seed = int(matrix.get('seed', 0))
+    valid = {f.name for f in fields(nbt.BackingTrackConfig)}
+
+    unknown = (set(base) | set(axes)) - valid
+    if unknown:
+        raise SystemExit(
+            f"Unknown BackingTrackConfig fields: {', '.join(sorted(unknown))}")
+
+    jobs = []
+    names = list(axes)
+    for values in itertools.product(*(axes[name] for name in names)):
+        options = {**base, **dict(zip(names, values))}
+        # One seed covers every draw (plucks included), so a rerun
+        # renders bit-identical audio
+        options.setdefault('seed', seed)
+        config = nbt.BackingTrackConfig(**options)
+
+        fingerprint = nbt.config_fingerprint(config)
+        job_name = '_'.join(f"{name}-{value}"
+                            for name, value in zip(names, values)) or 'track'
+        jobs.append({
+            'name': job_name,
+            'config': asdict(config),
+            'fingerprint': fingerprint,
+            'seed': config.seed,
+            'output_dir': str(output_dir / job_name),
+        })
+    return jobs
+
+
+def is_up_to_date(job: dict, manifest: dict) -> bool:
+    """True when the manifest holds this exact job with all files present"""
+    entry = manifest.get('jobs', {}).get(job['name'])
+    if not entry or entry.get('fingerprint') != job['fingerprint']:
+        return False
+    files = entry.get('results', {}).get('files', {})
+    # The fingerprint covers audio only; stems are kept per job
+    if job['config']['keep_intermediates'] and 'raw_audio' not in files:
+        return False
+    return bool(files) and all(Path(p).exists() for p in files.values())
+
+
+def prewarm_filter_banks(styles: List[str],
+                         sample_rates: Iterable[int] = (44100,)) -> None:
+    """Design every style's filter bank once per rate (pool initializer)"""
+    for sample_rate in sample_rates:
+        for style in styles:
+            nbt.get_amp_filter_bank(style, sample_rate)
+        nbt.get_bass_filter_bank(sample_rate)
+
+
+def render_job(job: dict) -> dict:
+    """Render one job in a worker process"""
+    config = nbt.BackingTrackConfig(**job['config'])
+
+    start = time.perf_counter()
+    # Per-track progress output from workers would interleave
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = nbt.generate_backing_track(
+            config, job['output_dir'],
+            trace_allocations=job.get('trace_allocations', False),
+            profile_path=job.get('profile_path'))
+
+    return {
+        'fingerprint': job['fingerprint'],
+        'seed': job['seed'],
+        'seconds': round(time.perf_counter() - start, 3),
+        'results': results,
+    }
+
+
+def write_manifest(manifest: dict, output_dir: Path) -> None:
+    """Atomically replace the manifest file"""
+    path = output_dir / MANIFEST_NAME
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_batch(matrix: dict, output_dir: str = None, workers: int = None,
+              force: bool = False, profile_dir: str = None,
+              trace_allocations: bool = False) -> dict:
+    """
+    Render all out-of-date jobs in the matrix and return the manifest
+
+    With profile_dir, each job dumps a cProfile to <profile_dir>/<job>.prof.
+    """
+    output_dir = Path(output_dir or matrix.get('output_dir', 'library'))
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = {'jobs': {}}
+    if manifest_path.exists():
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    jobs = expand_jobs(matrix, output_dir)
+    pending = [job for job in jobs
+               if force or not is_up_to_date(job, manifest)]
+    if profile_dir:
+        Path(profile_dir).mkdir(parents=True, exist_ok=True)
+    for job in pending:
+        job['trace_allocations'] = trace_allocations
+        if profile_dir:
+            job['profile_path'] = str(
+                Path(profile_dir) / f"{job['name']}.prof")
+    print(f"{len(jobs)} jobs, {len(jobs) - len(pending)} up to date, "
+          f"{len(pending)} to render")
+    if not pending:
+        return manifest
+
+    styles = sorted({job['config']['style'] for job in pending})
+    sample_rates = sorted({
+        nbt.effective_config(
+            nbt.BackingTrackConfig(**job['config'])).sample_rate
+        for job in pending})
+    # Filter banks designed here are inherited by forked workers; the
+    # initializer covers spawn-based platforms
+    prewarm_filter_banks(styles, sample_rates)
+
+    workers = workers or matrix.get('workers') or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=prewarm_filter_banks,
+                             initargs=(styles, sample_rates)) as pool:
+        futures = {pool.submit(render_job, job): job for job in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            try:
+                manifest['jobs'][job['name']] = future.result()
+                status = f"{manifest['jobs'][job['name']]['seconds']}s"
+            except Exception as e:
+                # Keep the last good render (its files are still valid)
+                # next to the error
+                entry = dict(manifest['jobs'].get(job['name'])
+                             or {'fingerprint': None})
+                entry['error'] = f"{type(e).__name__}: {e}"
+                entry['error_fingerprint'] = job['fingerprint']
+                manifest['jobs'][job['name']] = entry
+                status = f"FAILED ({e})"
+            write_manifest(manifest, output_dir)
+            print(f"  [{done}/{len(pending)}] {job['name']}: {status}")
+
+    return manifest
+
+
+def main() -> None:
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Render a backing track library from a config matrix')
+    parser.add_argument('matrix', help='Matrix file (JSON or YAML)')
+    parser.add_argument('--output', '-o', default=None,
+                        help='Output directory (overrides matrix file)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render jobs that are already up to date')
+    parser.add_argument('--profile-dir', default=None,
+                        help='Dump a cProfile (.prof) per job here')
+    parser.add_argument('--trace-allocations', action='store_true',
+                        help='Record peak allocated bytes per stage')
+
+    args = parser.parse_args()
+
+    matrix = load_matrix(args.matrix)
+    manifest = run_batch(matrix, args.output, args.workers, args.force,
+                         args.profile_dir, args.trace_allocations)
+
+    failed = [name for name, entry in manifest['jobs'].items()
+              if 'error' in entry]
+    written = sum(entry['results'].get('bytes_written', {}).get('total', 0)
+                  for entry in manifest['jobs'].values()
+                  if 'results' in entry)
+    print("\n=== Batch Complete ===")
+    print(f"{len(manifest['jobs']) - len(failed)} rendered, "
+          f"{len(failed)} failed, {written / 1024 ** 2:.1f} MB on disk")
+
+
+if __name__ == '__main__':
+    main()
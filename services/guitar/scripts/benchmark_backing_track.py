@@ -0,0 +1,1122 @@
+#!/usr/bin/env python3
+"""
+Backing Track Synthesis Benchmarks
+
+Benchmarks:
+- karplus: block Karplus-Strong engine vs the per-sample reference loop,
+  replaying every pluck a real render makes (default 4-bar and 64-bar metal)
+- pluck-cache: guitar + bass render time with and without the pluck cache,
+  with hit/miss counts
+- modulation: vectorized fractional-delay phaser/flanger/chorus vs the
+  per-sample reference loops
+- harmonics: wavetable harmonic layers vs direct per-harmonic sines
+- memory: peak RSS and page faults per rendered second of guitar + bass
+  synthesis, each measured in a fresh process, optionally against the
+  engine at another git revision
+- suite: real-time factor (audio seconds per wall second) and peak memory
+  of every pipeline stage across bars, styles, modulation types and bass
+  on/off, saved as JSON and compared against a stored baseline
+- startup: fresh-interpreter import and --list-presets time plus the
+  slowest imports (python -X importtime), optionally against another rev
+- schedule: time and memory to schedule a progression as ChordEvent
+  objects vs a structured event table, plus the vectorized note schedules
+- overlap-add: the guitar scheduler (render(), each unique note rendered
+  once) against the per-chunk render_reference(), plus guitar and bass
+  note placement by overlap_add() against a plain per-note slice loop
+- dynamics: amp output stage (gain calibration and release, look-ahead
+  limiter) cost per audio second across block sizes, its peak against
+  the ceiling and its difference from a whole-track pass
+- stream: per-bar render time of the streaming renderer against the bar's
+  playback time, and time to the first block, across tempos
+- quality: render time of the preview tier against a final render of the
+  same config
+- parallel: guitar + bass synthesis of one long track across
+  synth_workers thread counts, with the speedup over one worker
+- determinism: SHA-256 of a seeded render across synth_workers counts,
+  with and without the pluck cache and memory-mapped buffers, optionally
+  against golden hashes from an earlier run
+
+Usage:
+    python benchmark_backing_track.py karplus
+    python benchmark_backing_track.py karplus --bars 4 64 --min-speedup 50
+    python benchmark_backing_track.py pluck-cache --bars 4 32 128
+    python benchmark_backing_track.py modulation --seconds 10
+    python benchmark_backing_track.py harmonics
+    python benchmark_backing_track.py memory --bars 32 --baseline-rev HEAD~1
+    python benchmark_backing_track.py suite --output baseline.json
+    python benchmark_backing_track.py suite --baseline baseline.json
+    python benchmark_backing_track.py stream --bpm 90 120 200 --bass
+    python benchmark_backing_track.py startup --baseline-rev HEAD~1
+    python benchmark_backing_track.py schedule --bars 10000
+    python benchmark_backing_track.py overlap-add --bars 64 256
+    python benchmark_backing_track.py dynamics --block-size 512 65536
+    python benchmark_backing_track.py dynamics --sample-rate 96000
+    python benchmark_backing_track.py quality --modulation chorus --bass
+    python benchmark_backing_track.py parallel --bars 512 --workers 1 2 4 8
+    python benchmark_backing_track.py determinism --golden golden.json
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+import neural_backing_track as nbt
+
+
+def record_karplus_calls(config: nbt.BackingTrackConfig) -> List[Tuple]:
+    """Run one uncached guitar render and record every karplus_strong() call"""
+    config = replace(config, pluck_cache=False)
+    calls = []
+    engine = nbt.karplus_strong
+
+    def recording_engine(*args, **kwargs):
+        # Unseeded renders pass rng=None, which the reference loop lacks
+        recorded = {k: v for k, v in kwargs.items() if k != 'rng'}
+        calls.append((args, recorded))
+        return engine(*args, **kwargs)
+
+    nbt.karplus_strong = recording_engine
+    try:
+        nbt.render_guitar_audio(config)
+    finally:
+        nbt.karplus_strong = engine
+    return calls
+
+
+def time_karplus_calls(engine, calls: List[Tuple], seed: int = 0,
+                       repeats: int = 1) -> float:
+    """Best wall time over repeats replaying recorded calls on an engine"""
+    best = float('inf')
+    for _ in range(repeats):
+        np.random.seed(seed)
+        start = time.perf_counter()
+        for args, kwargs in calls:
+            engine(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_karplus_parity(calls: List[Tuple], seed: int = 0) -> float:
+    """Max absolute deviation between block engine and reference loop"""
+    worst = 0.0
+    for i, (args, kwargs) in enumerate(calls):
+        np.random.seed(seed + i)
+        reference = nbt.karplus_strong_reference(*args, **kwargs)
+        np.random.seed(seed + i)
+        block = nbt.karplus_strong(*args, **kwargs)
+        if reference.shape != block.shape:
+            return float('inf')
+        if len(reference):
+            worst = max(worst, float(np.max(np.abs(reference - block))))
+    return worst
+
+
+def benchmark_karplus(bars_list: List[int], style: str = 'metal',
+                      repeats: int = 3) -> dict:
+    """
+    Compare block Karplus-Strong engine against the reference loop.
+
+    The block engine is timed best-of-repeats; the reference loop runs once
+    (it takes seconds, so warm-up noise is negligible).
+    """
+    results = {}
+    for bars in bars_list:
+        config = nbt.BackingTrackConfig(style=style, bars=bars)
+        calls = record_karplus_calls(config)
+
+        deviation = check_karplus_parity(calls)
+        reference_time = time_karplus_calls(
+            nbt.karplus_strong_reference, calls)
+        block_time = time_karplus_calls(
+            nbt.karplus_strong, calls, repeats=repeats)
+
+        results[f"{bars}_bars"] = {
+            'style': style,
+            'plucks': len(calls),
+            'reference_seconds': round(reference_time, 4),
+            'block_seconds': round(block_time, 4),
+            'speedup': round(reference_time / max(block_time, 1e-9), 1),
+            'max_deviation': deviation,
+            'within_tolerance': deviation <= nbt.KS_PARITY_TOLERANCE,
+        }
+        print(f"  {bars:>3} bars: {len(calls)} plucks, "
+              f"reference {reference_time:.3f}s, block {block_time:.3f}s "
+              f"({results[f'{bars}_bars']['speedup']}x), "
+              f"max deviation {deviation:.2e}")
+    return results
+
+
+def time_render(config: nbt.BackingTrackConfig) -> float:
+    """Wall time of the guitar + bass synthesis stages for one config"""
+    start = time.perf_counter()
+    nbt.render_guitar_audio(config)
+    nbt.synthesize_bass_audio(config)
+    return time.perf_counter() - start
+
+
+def benchmark_pluck_cache(bars_list: List[int], style: str = 'metal',
+                          seed: int = 0) -> dict:
+    """Render time with and without the pluck cache, starting cold"""
+    results = {}
+    for bars in bars_list:
+        uncached = nbt.BackingTrackConfig(
+            style=style, bars=bars, pluck_cache=False)
+        cached = replace(uncached, pluck_cache=True, pluck_seed=seed)
+
+        uncached_time = time_render(uncached)
+        nbt.PLUCK_CACHE.clear()
+        cached_time = time_render(cached)
+        stats = nbt.PLUCK_CACHE.stats()
+
+        results[f"{bars}_bars"] = {
+            'style': style,
+            'uncached_seconds': round(uncached_time, 4),
+            'cached_seconds': round(cached_time, 4),
+            'speedup': round(uncached_time / max(cached_time, 1e-9), 1),
+            **stats,
+        }
+        print(f"  {bars:>3} bars: uncached {uncached_time:.3f}s, "
+              f"cached {cached_time:.3f}s "
+              f"({results[f'{bars}_bars']['speedup']}x), "
+              f"{stats['hits']} hits / {stats['misses']} misses")
+    return results
+
+
+def benchmark_modulation(seconds: float, sample_rate: int = 44100,
+                         effects: List[str] = None) -> dict:
+    """Compare vectorized modulation effects against the reference loops"""
+    effects = effects or ['phaser', 'flanger', 'chorus']
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, int(seconds * sample_rate))
+    audio = audio.astype(np.float32)
+
+    results = {}
+    for effect in effects:
+        start = time.perf_counter()
+        reference = nbt.apply_modulation_reference(audio, sample_rate, effect)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vectorized = nbt.apply_modulation(audio, sample_rate, effect)
+        vectorized_time = time.perf_counter() - start
+
+        # Fractional vs integer delay: outputs differ by design
+        rms_difference = float(np.sqrt(np.mean((reference - vectorized) ** 2)))
+        results[effect] = {
+            'audio_seconds': seconds,
+            'reference_seconds': round(reference_time, 4),
+            'vectorized_seconds': round(vectorized_time, 4),
+            'speedup': round(reference_time / max(vectorized_time, 1e-9), 1),
+            'rms_difference': round(rms_difference, 6),
+        }
+        print(f"  {effect:>8}: reference {reference_time:.3f}s, "
+              f"vectorized {vectorized_time:.4f}s "
+              f"({results[effect]['speedup']}x)")
+    return results
+
+
+def benchmark_harmonics(notes: int = 200, n_samples: int = 11025,
+                        sample_rate: int = 44100) -> dict:
+    """Compare wavetable harmonic layers against direct sine synthesis"""
+    rng = np.random.default_rng(0)
+    # Guitar range E2..E5 as MIDI notes
+    freqs = 440 * 2 ** ((rng.integers(40, 77, notes) - 69) / 12)
+
+    results = {}
+    for kind in ['guitar', 'bass']:
+        reference_fn = getattr(nbt, f'render_{kind}_harmonics_reference')
+        wavetable_fn = getattr(nbt, f'render_{kind}_harmonics')
+
+        start = time.perf_counter()
+        for freq in freqs:
+            reference_fn(freq, n_samples, sample_rate)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for freq in freqs:
+            wavetable_fn(freq, n_samples, sample_rate)
+        wavetable_time = time.perf_counter() - start
+
+        deviation = max(
+            float(np.max(np.abs(reference_fn(f, n_samples, sample_rate)
+                                - wavetable_fn(f, n_samples, sample_rate))))
+            for f in freqs[:20])
+        results[kind] = {
+            'notes': notes,
+            'reference_seconds': round(reference_time, 4),
+            'wavetable_seconds': round(wavetable_time, 4),
+            'speedup': round(reference_time / max(wavetable_time, 1e-9), 1),
+            'max_deviation': deviation,
+        }
+        print(f"  {kind:>6}: sines {reference_time:.3f}s, "
+              f"wavetable {wavetable_time:.3f}s "
+              f"({results[kind]['speedup']}x), "
+              f"max deviation {deviation:.1e}")
+    return results
+
+
+# Run with: python -c MEMORY_PROBE <module_dir> <bars> <style>, so the
+# engine under test is the only one imported in the measured process
+MEMORY_PROBE = """
+import json, resource, sys, tempfile, time
+from pathlib import Path
+module_dir, bars, style = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+sys.path.insert(0, module_dir)
+import neural_backing_track as engine
+
+config = engine.BackingTrackConfig(style=style, bars=bars)
+before = resource.getrusage(resource.RUSAGE_SELF)
+start = time.perf_counter()
+if hasattr(engine, 'render_guitar_audio'):
+    engine.render_guitar_audio(config)
+else:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine.synthesize_guitar_audio(None, str(Path(tmp) / 'raw.wav'),
+                                       config)
+engine.synthesize_bass_audio(config)
+elapsed = time.perf_counter() - start
+after = resource.getrusage(resource.RUSAGE_SELF)
+
+audio_seconds = bars * config.beats_per_bar * 60 / config.bpm
+print(json.dumps({
+    'audio_seconds': audio_seconds,
+    'render_seconds': round(elapsed, 4),
+    'peak_rss_mb': round(after.ru_maxrss / 1024, 1),
+    'rss_growth_mb': round((after.ru_maxrss - before.ru_maxrss) / 1024, 1),
+    'page_faults_per_audio_second': round(
+        (after.ru_minflt - before.ru_minflt) / audio_seconds, 1),
+}))
+"""
+
+
+def engine_dirs(baseline_rev: Optional[str], tmp: str) -> dict:
+    """Engine directories by name: this tree, plus baseline_rev in tmp"""
+    engines = {'current': str(Path(__file__).resolve().parent)}
+    if baseline_rev:
+        source = subprocess.run(
+            ['git', 'show', f"{baseline_rev}:./neural_backing_track.py"],
+            cwd=engines['current'], capture_output=True, text=True,
+            check=True).stdout
+        (Path(tmp) / 'neural_backing_track.py').write_text(source)
+        engines[baseline_rev] = tmp
+    return engines
+
+
+def measure_memory(module_dir: str, bars: int, style: str) -> dict:
+    """Run MEMORY_PROBE for an engine directory in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, '-c', MEMORY_PROBE, module_dir, str(bars), style],
+        capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def benchmark_memory(bars_list: List[int], style: str = 'metal',
+                     baseline_rev: str = None) -> dict:
+    """
+    Peak memory and allocation pressure of the synthesis stages.
+
+    Page faults stand in for allocation count: every fresh large numpy
+    buffer is mmap-backed and faults its pages in on first write, while
+    reused work buffers do not.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = engine_dirs(baseline_rev, tmp)
+        results = {}
+        for bars in bars_list:
+            for name, module_dir in engines.items():
+                usage = measure_memory(module_dir, bars, style)
+                results[f"{name}_{bars}_bars"] = usage
+                print(f"  {name:>10} {bars:>3} bars: "
+                      f"peak RSS {usage['peak_rss_mb']} MB "
+                      f"(+{usage['rss_growth_mb']} MB), "
+                      f"{usage['page_faults_per_audio_second']} "
+                      f"faults/audio-s, {usage['render_seconds']}s")
+    return results
+
+
+SUITE_STYLES = ['rock', 'blues', 'metal', 'metal_reference', 'punk',
+                'grunge', 'djent']
+SUITE_MODULATIONS = ['phaser', 'flanger', 'chorus']
+
+
+def measure_stage(stage: Callable[[], object], audio_seconds: float,
+                  track_memory: bool = True) -> dict:
+    """
+    Real-time factor and peak traced memory of one stage call.
+
+    The stage runs once for timing and, with track_memory, once more under
+    tracemalloc (numpy buffers are traced) so tracing overhead does not
+    distort the timing.
+    """
+    nbt.PLUCK_CACHE.clear()
+    np.random.seed(0)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        stage()
+    wall = time.perf_counter() - start
+
+    result = {
+        'audio_seconds': round(audio_seconds, 3),
+        'wall_seconds': round(wall, 4),
+        'realtime_factor': round(audio_seconds / max(wall, 1e-9), 2),
+    }
+
+    if track_memory:
+        nbt.PLUCK_CACHE.clear()
+        np.random.seed(0)
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            stage()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_memory_mb'] = round(peak / 1024 ** 2, 2)
+
+    return result
+
+
+def run_suite(bars_list: List[int], styles: List[str],
+              modulations: List[str], track_memory: bool = True) -> dict:
+    """Benchmark every pipeline stage across the suite matrix"""
+    cases = {}
+
+    # Warm up lazy imports (scipy.signal) so the first case isn't charged
+    with tempfile.TemporaryDirectory() as tmp, \
+            contextlib.redirect_stdout(io.StringIO()):
+        nbt.generate_backing_track(
+            nbt.BackingTrackConfig(bars=1, include_bass=True), tmp)
+
+    def record(name: str, stage: Callable[[], object],
+               audio_seconds: float) -> None:
+        cases[name] = measure_stage(stage, audio_seconds, track_memory)
+        r = cases[name]
+        memory = (f", peak {r['peak_memory_mb']} MB"
+                  if 'peak_memory_mb' in r else '')
+        print(f"  {name:<40} {r['realtime_factor']:>8}x realtime{memory}")
+
+    for bars in bars_list:
+        for style in styles:
+            config = nbt.BackingTrackConfig(style=style, bars=bars,
+                                            pluck_seed=0)
+            audio_seconds = bars * config.beats_per_bar * 60 / config.bpm
+            guitar = nbt.render_guitar_audio(config)
+
+            record(f"guitar_synth/{style}/{bars}",
+                   lambda: nbt.render_guitar_audio(config), audio_seconds)
+            record(f"amp_sim/{style}/{bars}",
+                   lambda: nbt.apply_amp_simulation(guitar, 44100, style),
+                   audio_seconds)
+
+        config = nbt.BackingTrackConfig(bars=bars, pluck_seed=0)
+        audio_seconds = bars * config.beats_per_bar * 60 / config.bpm
+        guitar = nbt.render_guitar_audio(config)
+        record(f"bass_synth/{bars}",
+               lambda: nbt.synthesize_bass_audio(config), audio_seconds)
+        for modulation in modulations:
+            record(f"modulation/{modulation}/{bars}",
+                   lambda: nbt.apply_modulation(guitar, 44100, modulation),
+                   audio_seconds)
+
+        for include_bass in (False, True):
+            track = replace(config, include_bass=include_bass)
+            with tempfile.TemporaryDirectory() as tmp:
+                record(f"generate/{'bass' if include_bass else 'guitar'}"
+                       f"/{bars}",
+                       lambda: nbt.generate_backing_track(track, tmp),
+                       audio_seconds)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'engine_version': nbt.SYNTH_ENGINE_VERSION,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+        },
+        'results': cases,
+    }
+
+
+def compare_to_baseline(suite: dict, baseline: dict,
+                        tolerance: float = 0.2) -> List[str]:
+    """
+    Flag cases that got slower or hungrier than the baseline.
+
+    A regression is a real-time factor more than tolerance below the
+    baseline, or peak memory more than tolerance above it.
+    """
+    regressions = []
+    for name, current in suite['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+
+        rtf_ratio = current['realtime_factor'] / \
+            max(previous['realtime_factor'], 1e-9)
+        if rtf_ratio < 1 - tolerance:
+            regressions.append(
+                f"{name}: realtime factor {previous['realtime_factor']}x "
+                f"-> {current['realtime_factor']}x")
+
+        if 'peak_memory_mb' in current and 'peak_memory_mb' in previous:
+            memory_ratio = current['peak_memory_mb'] / \
+                max(previous['peak_memory_mb'], 1e-9)
+            if memory_ratio > 1 + tolerance:
+                regressions.append(
+                    f"{name}: peak memory {previous['peak_memory_mb']} MB "
+                    f"-> {current['peak_memory_mb']} MB")
+
+    return regressions
+
+
+def benchmark_stream(bpm_list: List[int], bars: int = 16,
+                     style: str = 'metal', include_bass: bool = True,
+                     modulation: str = 'none') -> dict:
+    """Time every bar yielded by stream_backing_track against its length"""
+    results = {}
+    for bpm in bpm_list:
+        config = nbt.BackingTrackConfig(
+            style=style, bpm=bpm, bars=bars, include_bass=include_bass,
+            modulation=modulation)
+        bar_seconds = config.beats_per_bar * 60 / bpm
+
+        bar_times = []
+        blocks = nbt.stream_backing_track(config)
+        while True:
+            start = time.perf_counter()
+            block = next(blocks, None)
+            if block is None:
+                break
+            bar_times.append(time.perf_counter() - start)
+
+        slowest = max(bar_times)
+        results[f"{bpm}_bpm"] = {
+            'bar_seconds': round(bar_seconds, 4),
+            'first_block_seconds': round(bar_times[0], 4),
+            'max_bar_render_seconds': round(slowest, 4),
+            'mean_bar_render_seconds': round(
+                sum(bar_times) / len(bar_times), 4),
+            'realtime': slowest < bar_seconds,
+        }
+        print(f"  {bpm:>3} bpm: first block {bar_times[0] * 1000:.1f}ms, "
+              f"slowest bar {slowest * 1000:.1f}ms "
+              f"of {bar_seconds * 1000:.0f}ms")
+    return results
+
+
+def benchmark_schedule(bars_list: List[int], style: str = 'metal',
+                       repeats: int = 5) -> dict:
+    """
+    Time and memory to schedule a progression: the ChordEvent list from
+    generate_progression(), the progression_table() structured array,
+    and the vectorized guitar + bass note schedules built from the table
+    """
+    results = {}
+    for bars in bars_list:
+        config = nbt.BackingTrackConfig(style=style, bars=bars,
+                                        bass_style='octave')
+        guitar = nbt.GuitarChordRenderer(config)
+        bass = nbt.BassChordRenderer(config)
+        table = nbt.progression_table(config)
+
+        entry = {}
+        for name, build in [
+                ('event_list', lambda: nbt.generate_progression(config)),
+                ('table', lambda: nbt.progression_table(config)),
+                ('note_schedules',
+                 lambda: (guitar.schedule(table), bass.schedule(table)))]:
+            best = float('inf')
+            for _ in range(repeats):
+                start = time.perf_counter()
+                build()
+                best = min(best, time.perf_counter() - start)
+
+            tracemalloc.start()
+            kept = build()  # noqa: F841 (held while measuring)
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            entry[name] = {'ms': round(best * 1000, 3),
+                           'kb': round(current / 1024, 1)}
+        results[f"{bars}_bars"] = entry
+        print(f"  {bars:>6} bars: " + ", ".join(
+            f"{name} {e['ms']}ms {e['kb']}KB" for name, e in entry.items()))
+    return results
+
+
+def benchmark_overlap_add(bars_list: List[int], style: str = 'metal',
+                          rhythm: str = 'gallop', repeats: int = 3) -> dict:
+    """
+    Guitar scheduler: render() (each unique note rendered once, then
+    overlap-added) vs render_reference() (every chunk rendered and placed
+    on its own), from fresh renderers; speedup and max deviation (pick
+    noise takes and overlapping tails differ by design).
+
+    Then note placement alone for guitar and bass: overlap_add() of
+    cached note buffers vs a plain slice add per scheduled note, both on
+    warm buffers; outputs must match.
+    """
+    results = {}
+    for bars in bars_list:
+        config = nbt.BackingTrackConfig(style=style, bars=bars,
+                                        rhythm_pattern=rhythm)
+        table = nbt.progression_table(config)
+        n_samples = int(table['start'][-1] + table['n_samples'][-1])
+
+        entry = {}
+        outputs = []
+        for name in ('render', 'render_reference'):
+            best = float('inf')
+            for _ in range(repeats):
+                renderer = nbt.GuitarChordRenderer(config)
+                out = np.zeros(n_samples, dtype=np.float32)
+                np.random.seed(0)
+                start = time.perf_counter()
+                getattr(renderer, name)(table, out)
+                best = min(best, time.perf_counter() - start)
+            entry[f"{name}_ms"] = round(best * 1000, 2)
+            outputs.append(out)
+        entry['max_deviation'] = float(np.max(np.abs(outputs[0]
+                                                     - outputs[1])))
+        entry['speedup'] = round(
+            entry['render_reference_ms'] / entry['render_ms'], 2)
+        results[f"scheduler_{bars}_bars"] = entry
+        print(f"  scheduler {bars:>5} bars: {entry['render_ms']}ms vs "
+              f"{entry['render_reference_ms']}ms reference "
+              f"({entry['speedup']}x)")
+
+        for part, renderer_type in (('guitar', nbt.GuitarChordRenderer),
+                                    ('bass', nbt.BassChordRenderer)):
+            renderer = renderer_type(config)
+            np.random.seed(0)
+            notes = renderer.schedule(table)
+            keys = notes[['root_note', 'n_samples', 'velocity',
+                          'variant']].tolist()
+            for key in set(keys):
+                renderer.note_buffer(key)
+
+            def slice_loop(out: np.ndarray) -> None:
+                for start, key in zip(notes['start'].tolist(), keys):
+                    buffer = renderer.note_buffer(key)
+                    end = min(start + len(buffer), len(out))
+                    out[start:end] += buffer[:end - start]
+
+            entry = {'notes': len(notes), 'note_buffers': len(set(keys))}
+            outputs = []
+            for name, place in (
+                    ('overlap_add', lambda out: nbt.overlap_add(
+                        out, notes, renderer.note_buffer)),
+                    ('slice_loop', slice_loop)):
+                best = float('inf')
+                for _ in range(repeats):
+                    out = np.zeros(n_samples, dtype=np.float32)
+                    start = time.perf_counter()
+                    place(out)
+                    best = min(best, time.perf_counter() - start)
+                entry[f"{name}_ms"] = round(best * 1000, 2)
+                outputs.append(out)
+            entry['max_diff'] = float(np.max(np.abs(outputs[0]
+                                                    - outputs[1])))
+            entry['speedup'] = round(
+                entry['slice_loop_ms'] / entry['overlap_add_ms'], 2)
+            results[f"{part}_{bars}_bars"] = entry
+            print(f"  {part:>6} {bars:>5} bars: {entry['notes']} notes "
+                  f"from {entry['note_buffers']} buffers, "
+                  f"{entry['overlap_add_ms']}ms vs "
+                  f"{entry['slice_loop_ms']}ms")
+    return results
+
+
+def benchmark_dynamics(block_sizes: List[int], style: str = 'metal',
+                       bars: int = 16, repeats: int = 3,
+                       sample_rate: int = 44100) -> dict:
+    """
+    Amp output stage (gain calibration and release, look-ahead limiter)
+    run block by block over an amp chain's output: cost per second of
+    audio, the output peak against the 0.9 ceiling, and the largest
+    difference from one whole-track pass (block size independence)
+    """
+    config = nbt.BackingTrackConfig(style=style, bars=bars,
+                                    sample_rate=sample_rate)
+    bank = nbt.get_amp_filter_bank(style, sample_rate)
+    np.random.seed(0)
+    settings = nbt.AMP_SETTINGS.get(style, nbt.AMP_SETTINGS['metal'])
+    audio = nbt._amp_chain(nbt.render_guitar_audio(config), settings,
+                           bank, bank.filtfilt,
+                           nbt.amp_noise_gate(style, sample_rate))
+    audio_seconds = len(audio) / sample_rate
+    whole = np.concatenate(list(nbt.compensated(
+        iter([audio]), nbt.amp_output_stage(style, sample_rate))))
+
+    results = {}
+    for block_size in block_sizes:
+        best = float('inf')
+        for _ in range(repeats):
+            stage = nbt.amp_output_stage(style, sample_rate)
+            blocks = (audio[start:start + block_size]
+                      for start in range(0, len(audio), block_size))
+            start = time.perf_counter()
+            out = np.concatenate(list(nbt.compensated(blocks, stage)))
+            best = min(best, time.perf_counter() - start)
+        results[f"block_{block_size}"] = {
+            'ms_per_audio_second': round(best * 1000 / audio_seconds, 3),
+            'peak': round(float(np.max(np.abs(out))), 6),
+            'within_ceiling': bool(np.max(np.abs(out)) <= 0.9),
+            'max_diff_vs_whole': float(np.max(np.abs(out - whole))),
+            'latency_samples': stage.latency,
+        }
+        print(f"  block {block_size:>6}: "
+              f"{results[f'block_{block_size}']['ms_per_audio_second']}ms "
+              f"per audio second")
+    return results
+
+
+def benchmark_quality(bars_list: List[int], style: str = 'metal',
+                      modulation: str = 'none', include_bass: bool = False,
+                      repeats: int = 3) -> dict:
+    """
+    render_backing_audio() of one config at the 'final' and 'preview'
+    quality tiers: best wall time of each and the preview speedup
+    """
+    results = {}
+    for bars in bars_list:
+        entry = {}
+        for quality in nbt.QUALITY_TIERS:
+            config = nbt.BackingTrackConfig(
+                style=style, bars=bars, modulation=modulation,
+                include_bass=include_bass, quality=quality)
+            nbt.render_backing_audio(config)  # Warm filter banks and caches
+            best = float('inf')
+            for _ in range(repeats):
+                start = time.perf_counter()
+                nbt.render_backing_audio(config)
+                best = min(best, time.perf_counter() - start)
+            entry[f'{quality}_ms'] = round(best * 1000, 1)
+            entry[f'{quality}_sample_rate'] = (
+                nbt.effective_config(config).sample_rate)
+        entry['speedup'] = round(entry['final_ms'] / entry['preview_ms'], 2)
+        results[f"bars_{bars}"] = entry
+        print(f"  {bars:>4} bars: final {entry['final_ms']}ms, preview "
+              f"{entry['preview_ms']}ms ({entry['speedup']}x)")
+    return results
+
+
+def benchmark_parallel(workers_list: List[int], bars: int = 256,
+                       style: str = 'metal', repeats: int = 3) -> dict:
+    """
+    render_guitar_audio() + synthesize_bass_audio() of one track at each
+    synth_workers count: best wall time, real-time factor and speedup
+    over the first count
+    """
+    results = {'cpu_count': os.cpu_count()}
+    baseline = None
+    for workers in workers_list:
+        config = nbt.BackingTrackConfig(style=style, bars=bars,
+                                        include_bass=True,
+                                        synth_workers=workers)
+        audio_seconds = bars * config.beats_per_bar * 60 / config.bpm
+        nbt.render_guitar_audio(config)  # Warm the pluck cache
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            nbt.render_guitar_audio(config)
+            nbt.synthesize_bass_audio(config)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        results[f"workers_{workers}"] = entry = {
+            'ms': round(best * 1000, 1),
+            'realtime_factor': round(audio_seconds / best, 1),
+            'speedup': round(baseline / best, 2),
+        }
+        print(f"  {workers:>3} workers: {entry['ms']}ms "
+              f"({entry['speedup']}x)")
+    return results
+
+
+def benchmark_determinism(workers_list: List[int], bars: int = 8,
+                          style: str = 'metal', seed: int = 42,
+                          golden: Optional[dict] = None) -> dict:
+    """
+    SHA-256 of render_backing_audio() for one seeded config, rendered
+    with each synth_workers count, without the pluck cache, and into
+    memory-mapped buffers; every variant must match the first, or the
+    golden hash when it was recorded for the same config.
+
+    The global np.random state is scrambled before each render, so a draw
+    that bypasses the seed shows up as a mismatch.
+    """
+    config = nbt.BackingTrackConfig(style=style, bars=bars,
+                                    include_bass=True, seed=seed)
+    variants = {f"workers_{workers}": {'synth_workers': workers}
+                for workers in workers_list}
+    variants['uncached'] = {'pluck_cache': False}
+
+    def digest(overrides: dict) -> str:
+        np.random.seed(None)
+        audio = nbt.render_backing_audio(replace(config, **overrides))
+        return hashlib.sha256(np.ascontiguousarray(audio)).hexdigest()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        variants['mapped'] = {'buffer_dir': tmp}
+        hashes = {name: digest(overrides)
+                  for name, overrides in variants.items()}
+
+    fingerprint = nbt.config_fingerprint(config)
+    expected = next(iter(hashes.values()))
+    if golden and golden.get('config') == fingerprint:
+        expected = golden['sha256']
+    results = {'config': fingerprint, 'sha256': expected, 'variants': {}}
+    for name, sha in hashes.items():
+        results['variants'][name] = {'sha256': sha,
+                                     'identical': sha == expected}
+        print(f"  {name:>12}: {sha[:16]} "
+              f"{'ok' if sha == expected else 'MISMATCH'}")
+    return results
+
+
+def time_command(args: List[str], repeats: int) -> float:
+    """Best wall time in ms of a fresh interpreter running args"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True,
+                       check=True)
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 1)
+
+
+def slowest_imports(module_dir: str, count: int = 8) -> List[dict]:
+    """Top imports by cumulative time from python -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f"import sys; sys.path.insert(0, {module_dir!r}); "
+         f"import neural_backing_track"],
+        capture_output=True, text=True, check=True).stderr
+
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() != 'neural_backing_track':
+            imports.append({'module': name.strip(),
+                            'cumulative_ms': int(cumulative) / 1000})
+    imports.sort(key=lambda entry: -entry['cumulative_ms'])
+    return imports[:count]
+
+
+def benchmark_startup(repeats: int = 5,
+                      baseline_rev: Optional[str] = None) -> dict:
+    """
+    Cold-start cost of the engine in fresh interpreters: bare import,
+    --list-presets, and the slowest imports reported by -X importtime.
+
+    Interpreter startup (python -c pass) is reported separately; with
+    PYTHONDONTWRITEBYTECODE set, the import also pays for compiling the
+    module every run.
+    """
+    results = {'python_ms': time_command(['-c', 'pass'], repeats),
+               'bytecode_cached': not sys.flags.dont_write_bytecode}
+    print(f"  interpreter: {results['python_ms']}ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, module_dir in engine_dirs(baseline_rev, tmp).items():
+            script = str(Path(module_dir) / 'neural_backing_track.py')
+            entry = {
+                'import_ms': time_command(
+                    ['-c', f"import sys; sys.path.insert(0, {module_dir!r});"
+                           f" import neural_backing_track"], repeats),
+                'list_presets_ms': time_command(
+                    [script, '--list-presets'], repeats),
+                'slowest_imports': slowest_imports(module_dir),
+            }
+            results[name] = entry
+            print(f"  {name:>10}: import {entry['import_ms']}ms, "
+                  f"--list-presets {entry['list_presets_ms']}ms")
+    return results
+
+
+def main() -> None:
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark backing track synthesis')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    karplus = subparsers.add_parser(
+        'karplus', help='Block Karplus-Strong engine vs reference loop')
+    karplus.add_argument('--bars', type=int, nargs='+', default=[4, 64])
+    karplus.add_argument('--style', default='metal')
+    karplus.add_argument('--repeats', type=int, default=3)
+    karplus.add_argument('--min-speedup', type=float, default=50.0,
+                         help='Fail if any config is slower than this')
+
+    pluck_cache = subparsers.add_parser(
+        'pluck-cache', help='Render time with and without the pluck cache')
+    pluck_cache.add_argument('--bars', type=int, nargs='+',
+                             default=[4, 32, 128])
+    pluck_cache.add_argument('--style', default='metal')
+
+    modulation = subparsers.add_parser(
+        'modulation', help='Vectorized modulation vs reference loops')
+    modulation.add_argument('--seconds', type=float, default=10.0,
+                            help='Length of the test signal')
+    modulation.add_argument('--effects', nargs='+',
+                            choices=['phaser', 'flanger', 'chorus'],
+                            default=['phaser', 'flanger', 'chorus'])
+
+    harmonics = subparsers.add_parser(
+        'harmonics', help='Wavetable harmonic layers vs direct sines')
+    harmonics.add_argument('--notes', type=int, default=200)
+
+    memory = subparsers.add_parser(
+        'memory', help='Peak RSS and page faults of guitar + bass synthesis')
+    memory.add_argument('--bars', type=int, nargs='+', default=[4, 32])
+    memory.add_argument('--style', default='metal')
+    memory.add_argument('--baseline-rev', default=None,
+                        help='Also measure the engine at this git revision')
+
+    suite = subparsers.add_parser(
+        'suite', help='Per-stage real-time factor and peak memory')
+    suite.add_argument('--bars', type=int, nargs='+', default=[4, 32, 128])
+    suite.add_argument('--styles', nargs='+', default=SUITE_STYLES)
+    suite.add_argument('--modulations', nargs='+',
+                       default=SUITE_MODULATIONS)
+    suite.add_argument('--no-memory', action='store_true',
+                       help='Skip the tracemalloc peak memory pass')
+    suite.add_argument('--output', default=None,
+                       help='Write results JSON here')
+    suite.add_argument('--baseline', default=None,
+                       help='Results JSON to compare against')
+    suite.add_argument('--tolerance', type=float, default=0.2,
+                       help='Allowed fractional slowdown / memory growth')
+
+    stream = subparsers.add_parser(
+        'stream', help='Streaming renderer latency per bar')
+    stream.add_argument('--bpm', type=int, nargs='+',
+                        default=[90, 120, 200])
+    stream.add_argument('--bars', type=int, default=16)
+    stream.add_argument('--style', default='metal')
+    stream.add_argument('--modulation', default='none')
+    stream.add_argument('--bass', action='store_true',
+                        help='Include the bass track and streaming mixer')
+
+    schedule = subparsers.add_parser(
+        'schedule', help='Progression table and note scheduling cost')
+    schedule.add_argument('--bars', type=int, nargs='+',
+                          default=[16, 1000, 10000])
+    schedule.add_argument('--style', default='metal')
+
+    overlap = subparsers.add_parser(
+        'overlap-add',
+        help='Guitar scheduler vs per-chunk reference, and note placement')
+    overlap.add_argument('--bars', type=int, nargs='+',
+                         default=[16, 64, 256])
+    overlap.add_argument('--style', default='metal')
+    overlap.add_argument('--rhythm', default='gallop')
+
+    dynamics = subparsers.add_parser(
+        'dynamics', help='Block-streaming output stage and limiter cost')
+    dynamics.add_argument('--block-size', type=int, nargs='+',
+                          default=[512, 8192, 65536])
+    dynamics.add_argument('--style', default='metal')
+    dynamics.add_argument('--bars', type=int, default=16)
+    dynamics.add_argument('--sample-rate', type=int, default=44100)
+    dynamics.add_argument('--max-diff', type=float, default=1e-5,
+                          help='Fail if any block size differs from a '
+                               'whole-track pass by more')
+
+    quality = subparsers.add_parser(
+        'quality', help='Preview vs final quality tier render time')
+    quality.add_argument('--bars', type=int, nargs='+', default=[8, 32])
+    quality.add_argument('--style', default='metal')
+    quality.add_argument('--modulation', default='none')
+    quality.add_argument('--bass', action='store_true',
+                         help='Include the bass track and mix')
+    quality.add_argument('--min-speedup', type=float, default=None,
+                         help='Fail if preview is less than this much '
+                              'faster')
+
+    parallel = subparsers.add_parser(
+        'parallel', help='Synthesis time across synth_workers threads')
+    parallel.add_argument('--workers', type=int, nargs='+',
+                          default=[1, 2, 4])
+    parallel.add_argument('--bars', type=int, default=256)
+    parallel.add_argument('--style', default='metal')
+
+    determinism = subparsers.add_parser(
+        'determinism', help='Seeded render hashes across workers and caches')
+    determinism.add_argument('--workers', type=int, nargs='+',
+                             default=[1, 2, 3, 7])
+    determinism.add_argument('--bars', type=int, default=8)
+    determinism.add_argument('--style', default='metal')
+    determinism.add_argument('--seed', type=int, default=42)
+    determinism.add_argument('--golden', default=None,
+                             help='Hash file to compare against (written '
+                                  'when missing)')
+
+    startup = subparsers.add_parser(
+        'startup', help='Import and --list-presets cold-start time')
+    startup.add_argument('--repeats', type=int, default=5)
+    startup.add_argument('--baseline-rev', default=None,
+                         help='Also time the engine at this git revision')
+    startup.add_argument('--max-import-ms', type=float, default=None,
+                         help='Fail if importing the engine takes longer')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'karplus':
+        print("Karplus-Strong: block engine vs reference loop")
+        results = benchmark_karplus(
+            args.bars, args.style, args.repeats)
+        print(json.dumps(results, indent=2))
+        failed = [name for name, r in results.items()
+                  if not r['within_tolerance']
+                  or r['speedup'] < args.min_speedup]
+        if failed:
+            print(f"FAILED: {', '.join(failed)}")
+            sys.exit(1)
+
+    elif args.benchmark == 'pluck-cache':
+        print("Pluck cache: cached vs uncached synthesis")
+        results = benchmark_pluck_cache(args.bars, args.style)
+        print(json.dumps(results, indent=2))
+
+    elif args.benchmark == 'modulation':
+        print("Modulation: vectorized vs reference loops")
+        results = benchmark_modulation(args.seconds, effects=args.effects)
+        print(json.dumps(results, indent=2))
+
+    elif args.benchmark == 'harmonics':
+        print("Harmonics: wavetable vs direct sines")
+        results = benchmark_harmonics(args.notes)
+        print(json.dumps(results, indent=2))
+
+    elif args.benchmark == 'memory':
+        print("Memory: guitar + bass synthesis")
+        results = benchmark_memory(args.bars, args.style, args.baseline_rev)
+        print(json.dumps(results, indent=2))
+
+    elif args.benchmark == 'suite':
+        print("Suite: per-stage real-time factor and peak memory")
+        results = run_suite(args.bars, args.styles, args.modulations,
+                            track_memory=not args.no_memory)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"Results saved to: {args.output}")
+
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            regressions = compare_to_baseline(
+                results, baseline, args.tolerance)
+            if regressions:
+                print(f"REGRESSIONS vs {args.baseline}:")
+                for regression in regressions:
+                    print(f"  - {regression}")
+                sys.exit(1)
+            print(f"No regressions vs {args.baseline}")
+
+    elif args.benchmark == 'stream':
+        print("Stream: per-bar render time vs bar duration")
+        results = benchmark_stream(args.bpm, args.bars, args.style,
+                                   args.bass, args.modulation)
+        print(json.dumps(results, indent=2))
+        late = [name for name, r in results.items() if not r['realtime']]
+        if late:
+            print(f"FAILED: bars slower than real time at {', '.join(late)}")
+            sys.exit(1)
+
+    elif args.benchmark == 'schedule':
+        print("Schedule: event list vs progression table")
+        results = benchmark_schedule(args.bars, args.style)
+        print(json.dumps(results, indent=2))
+
+    elif args.benchmark == 'overlap-add':
+        print("Overlap-add: scheduler vs per-chunk reference, placement")
+        results = benchmark_overlap_add(args.bars, args.style, args.rhythm)
+        print(json.dumps(results, indent=2))
+
+    elif args.benchmark == 'dynamics':
+        print("Dynamics: amp output stage block by block")
+        results = benchmark_dynamics(args.block_size, args.style, args.bars,
+                                     sample_rate=args.sample_rate)
+        print(json.dumps(results, indent=2))
+        over = [name for name, r in results.items()
+                if not r['within_ceiling']]
+        if over:
+            print(f"FAILED: output above the ceiling at {', '.join(over)}")
+            sys.exit(1)
+        varying = [name for name, r in results.items()
+                   if r['max_diff_vs_whole'] > args.max_diff]
+        if varying:
+            print(f"FAILED: output depends on block size at "
+                  f"{', '.join(varying)}")
+            sys.exit(1)
+
+    elif args.benchmark == 'quality':
+        print("Quality: preview tier vs final render")
+        results = benchmark_quality(args.bars, args.style, args.modulation,
+                                    args.bass)
+        print(json.dumps(results, indent=2))
+        slow = [name for name, r in results.items()
+                if args.min_speedup and r['speedup'] < args.min_speedup]
+        if slow:
+            print(f"FAILED: preview speedup below {args.min_speedup}x at "
+                  f"{', '.join(slow)}")
+            sys.exit(1)
+
+    elif args.benchmark == 'parallel':
+        print("Parallel: segment-parallel guitar + bass synthesis")
+        results = benchmark_parallel(args.workers, args.bars, args.style)
+        print(json.dumps(results, indent=2))
+
+    elif args.benchmark == 'determinism':
+        print("Determinism: seeded render hashes")
+        golden = None
+        if args.golden and Path(args.golden).exists():
+            with open(args.golden) as f:
+                golden = json.load(f)
+        results = benchmark_determinism(args.workers, args.bars, args.style,
+                                        args.seed, golden)
+        if args.golden and golden is None:
+            with open(args.golden, 'w') as f:
+                json.dump({'config': results['config'],
+                           'sha256': results['sha256']}, f, indent=2)
+            print(f"Golden hash saved to: {args.golden}")
+        elif golden and golden.get('config') != results['config']:
+            print(f"FAILED: {args.golden} was recorded for another config")
+            sys.exit(1)
+        mismatched = [name for name, r in results['variants'].items()
+                      if not r['identical']]
+        if mismatched:
+            print(f"FAILED: render differs at {', '.join(mismatched)}")
+            sys.exit(1)
+
+    elif args.benchmark == 'startup':
+        print("Startup: fresh-interpreter import time")
+        results = benchmark_startup(args.repeats, args.baseline_rev)
+        print(json.dumps(results, indent=2))
+        import_ms = results['current']['import_ms']
+        if args.max_import_ms and import_ms > args.max_import_ms:
+            print(f"FAILED: import took {import_ms}ms "
+                  f"(limit {args.max_import_ms}ms)")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Backing Track Render Service
+
+Local asyncio HTTP service around the backing track pipeline:
+1. POST /render with BackingTrackConfig JSON (plus optional "format":
+   wav, flac, ogg or opus) renders the track on a bounded process pool;
+   "quality": "preview" renders a fast low-rate preview, and the same
+   config with "quality": "final" renders the full take on demand
+2. Identical requests already in flight share one render (keyed by config
+   fingerprint and format)
+3. The worker renders and encodes the whole track in memory before the
+   response starts (it is not streamed while rendering); the encoded
+   file is then written to the client in chunks, paced by its read rate
+4. When max_pending distinct renders are queued, new renders are refused
+   with 503 + Retry-After; a render that exceeds job_timeout returns 504.
+   If a worker dies, the pool is replaced and its renders return 503
+5. Requests are bounded in size (bars, total samples, tempo, meter) and
+   limited to known keys, styles and sample rates and to bounded octave
+   and bass volume, so one request cannot start an unbounded render, grow
+   the workers' filter bank caches or fail inside a worker
+
+GET /health returns queue depth and counters as JSON.
+
+Standard library only (asyncio streams), no web framework required.
+
+Usage:
+    python render_service.py --port 8765 --workers 4
+    curl -d '{"key": "A", "style": "metal", "bars": 8}' -o track.wav \\
+         localhost:8765/render
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, fields
+from typing import Optional, Tuple
+
+import neural_backing_track as nbt
+from batch_backing_tracks import prewarm_filter_banks
+
+# Response Content-Type per nbt.AUDIO_FORMATS entry
+CONTENT_TYPES = {
+    'wav': 'audio/wav',
+    'flac': 'audio/flac',
+    'ogg': 'audio/ogg',
+    'opus': 'audio/ogg',
+}
+
+# Config fields set by the service, never by a request
+SERVER_FIELDS = {'buffer_dir'}
+
+# Largest request body accepted (a config is a few hundred bytes)
+MAX_BODY_BYTES = 64 * 1024
+
+# Largest track accepted, in samples per channel (10 minutes at 48kHz)
+MAX_TRACK_SAMPLES = 600 * 48000
+
+# Rates a request may ask for; each one adds filter banks to every worker
+SAMPLE_RATES = (16000, 22050, 24000, 32000, 44100, 48000, 88200, 96000)
+
+# Accepted ranges of the fields that scale render work
+BPM_RANGE = (20, 400)
+BEATS_PER_BAR_RANGE = (1, 16)
+SYNTH_WORKERS_RANGE = (1, 8)
+AMP_BLOCK_SIZE_RANGE = (256, 1 << 20)
+
+# Accepted ranges of the pitch and level fields
+OCTAVE_RANGE = (0, 6)
+BASS_VOLUME_RANGE = (0.0, 2.0)
+
+# Config fields that must be JSON numbers (int fields reject floats)
+INT_FIELDS = {'octave', 'bpm', 'bars', 'beats_per_bar', 'bass_octave',
+              'pluck_seed', 'seed', 'amp_block_size', 'sample_rate',
+              'bit_depth', 'synth_workers'}
+FLOAT_FIELDS = {'bass_volume'}
+
+# Bytes written per chunk of an audio response
+RESPONSE_CHUNK_BYTES = 64 * 1024
+
+STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+    504: 'Gateway Timeout',
+}
+
+
+class RequestError(Exception):
+    """Client error carrying the HTTP status to respond with"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def render_to_bytes(config_dict: dict, audio_format: str) -> bytes:
+    """Render one config and encode it (runs in a worker process)"""
+    config = nbt.effective_config(nbt.BackingTrackConfig(**config_dict))
+    audio = nbt.render_backing_audio(config)
+
+    buffer = io.BytesIO()
+    nbt.write_audio(buffer, audio, config.sample_rate, audio_format,
+                    config.bit_depth)
+    return buffer.getvalue()
+
+
+def parse_render_request(body: bytes, max_bars: int
+                         ) -> Tuple[nbt.BackingTrackConfig, str]:
+    """Validate a /render body into a config and output format"""
+    try:
+        options = json.loads(body or b'{}')
+    except ValueError as e:
+        raise RequestError(400, f"Invalid JSON: {e}")
+    if not isinstance(options, dict):
+        raise RequestError(400, "Body must be a JSON object")
+
+    audio_format = options.pop('format',
+                               options.get('output_format', 'wav'))
+    if audio_format not in CONTENT_TYPES:
+        raise RequestError(
+            400, f"Unsupported format: {audio_format} "
+                 f"(choose from {', '.join(CONTENT_TYPES)})")
+    # Validated against sample_rate and bit_depth with the config
+    options['output_format'] = audio_format
+
+    # Where workers put track buffers is the server's call (--buffer-dir)
+    valid = {f.name for f in fields(nbt.BackingTrackConfig)} - SERVER_FIELDS
+    unknown = set(options) - valid
+    if unknown:
+        raise RequestError(
+            400, f"Unknown BackingTrackConfig fields: "
+                 f"{', '.join(sorted(unknown))}")
+    check_field_types(options)
+
+    try:
+        config = nbt.BackingTrackConfig(**options)
+    except (TypeError, ValueError) as e:
+        raise RequestError(400, str(e))
+    # Limits apply to what renders (a preview's rate, not the requested one)
+    check_work_size(nbt.effective_config(config), max_bars)
+    return config, audio_format
+
+
+def check_field_types(options: dict) -> None:
+    """Reject numeric fields given as strings, booleans or the wrong kind"""
+    for name, value in options.items():
+        if value is None and name in ('pluck_seed', 'seed'):
+            continue
+        if name in INT_FIELDS:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+            kind = 'an integer'
+        elif name in FLOAT_FIELDS:
+            valid = (isinstance(value, (int, float))
+                     and not isinstance(value, bool))
+            kind = 'a number'
+        else:
+            continue
+        if not valid:
+            raise RequestError(400, f"{name} must be {kind}")
+
+
+def check_work_size(config: nbt.BackingTrackConfig, max_bars: int) -> None:
+    """Reject configs outside the service limits (see MAX_TRACK_SAMPLES)"""
+    ranges = {'bars': (1, max_bars), 'bpm': BPM_RANGE,
+              'beats_per_bar': BEATS_PER_BAR_RANGE,
+              'synth_workers': SYNTH_WORKERS_RANGE,
+              'amp_block_size': AMP_BLOCK_SIZE_RANGE,
+              'octave': OCTAVE_RANGE, 'bass_octave': OCTAVE_RANGE,
+              'bass_volume': BASS_VOLUME_RANGE}
+    for name, (low, high) in ranges.items():
+        if not low <= getattr(config, name) <= high:
+            raise RequestError(
+                400, f"{name} must be between {low} and {high}")
+    if config.sample_rate not in SAMPLE_RATES:
+        raise RequestError(
+            400, f"sample_rate must be one of "
+                 f"{', '.join(map(str, SAMPLE_RATES))}")
+    if config.style not in nbt.AMP_SETTINGS:
+        raise RequestError(
+            400, f"Unknown style: {config.style} "
+                 f"(choose from {', '.join(nbt.AMP_SETTINGS)})")
+    if config.key not in nbt.NOTES:
+        raise RequestError(
+            400, f"Unknown key: {config.key} "
+                 f"(choose from {', '.join(nbt.NOTES)})")
+
+    seconds = config.bars * config.beats_per_bar * 60 / config.bpm
+    if seconds * config.sample_rate > MAX_TRACK_SAMPLES:
+        raise RequestError(
+            400, f"Track too long: {seconds:.0f}s at {config.sample_rate} "
+                 f"Hz is over {MAX_TRACK_SAMPLES} samples")
+
+
+class RenderService:
+    """
+    Bounded, deduplicating render queue in front of a process pool.
+
+    Each distinct (config fingerprint, format) renders once however many
+    clients ask for it while it is in flight. A worker process cannot be
+    interrupted, so a timed-out render keeps its worker until it finishes;
+    it still counts towards max_pending, which bounds the work queued
+    behind it. A worker that dies breaks the whole pool, so it is replaced
+    and the renders it failed return 503.
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 max_pending: Optional[int] = None,
+                 job_timeout: float = 120.0, max_bars: int = 256,
+                 buffer_dir: Optional[str] = None):
+        self.workers = workers or os.cpu_count()
+        self.max_pending = max_pending or self.workers * 4
+        self.job_timeout = job_timeout
+        self.max_bars = max_bars
+        self.buffer_dir = buffer_dir
+        self.pool = None
+        self._in_flight = {}
+        self.stats = {'requests': 0, 'served': 0, 'deduplicated': 0,
+                      'rejected': 0, 'timed_out': 0, 'failed': 0,
+                      'pool_restarts': 0}
+
+    def start(self) -> None:
+        # Workers start lazily; forked ones would inherit open client
+        # sockets and hold those connections open after we close them.
+        # forkserver children start from a clean process with the engine
+        # preloaded instead.
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['neural_backing_track'])
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context,
+            initializer=prewarm_filter_banks,
+            initargs=(list(nbt.AMP_SETTINGS),
+                      [44100, nbt.PREVIEW_SAMPLE_RATE]))
+
+    async def warm_up(self) -> None:
+        """Start every worker (and design filter banks) before serving"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid)
+                               for _ in range(self.workers)))
+
+    def shutdown(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def replace_broken_pool(self, pool: ProcessPoolExecutor
+                            ) -> RequestError:
+        """
+        Start a new pool in place of a broken one (once, however many
+        renders it failed) and return the 503 for the failed render
+        """
+        self.stats['failed'] += 1
+        if self.pool is pool:
+            self.stats['pool_restarts'] += 1
+            self.shutdown()
+            self.start()
+        return RequestError(503, "Render worker died, retry later")
+
+    def health(self) -> dict:
+        return {'workers': self.workers, 'max_pending': self.max_pending,
+                'pending': len(self._in_flight), **self.stats}
+
+    async def render(self, config: nbt.BackingTrackConfig,
+                     audio_format: str) -> bytes:
+        """Encoded audio for config, joining an identical in-flight job"""
+        key = (nbt.config_fingerprint(config), audio_format)
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            future, pool = in_flight
+            self.stats['deduplicated'] += 1
+        else:
+            if len(self._in_flight) >= self.max_pending:
+                self.stats['rejected'] += 1
+                raise RequestError(503, "Render queue full, retry later")
+            loop = asyncio.get_running_loop()
+            config_dict = {**asdict(config), 'buffer_dir': self.buffer_dir}
+            pool = self.pool
+            try:
+                future = loop.run_in_executor(
+                    pool, render_to_bytes, config_dict, audio_format)
+            except BrokenProcessPool:
+                raise self.replace_broken_pool(pool)
+            self._in_flight[key] = future, pool
+            future.add_done_callback(
+                lambda _: self._in_flight.pop(key, None))
+
+        try:
+            # shield: one client timing out must not cancel the shared job
+            data = await asyncio.wait_for(
+                asyncio.shield(future), self.job_timeout)
+        except asyncio.TimeoutError:
+            self.stats['timed_out'] += 1
+            raise RequestError(
+                504, f"Render exceeded {self.job_timeout:g}s timeout")
+        except BrokenProcessPool:
+            raise self.replace_broken_pool(pool)
+        except Exception as e:
+            self.stats['failed'] += 1
+            raise RequestError(500, f"Render failed: "
+                                    f"{type(e).__name__}: {e}")
+        self.stats['served'] += 1
+        return data
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP/1.1 request per connection"""
+        try:
+            try:
+                method, path, body = await read_request(reader)
+                self.stats['requests'] += 1
+                if path == '/health':
+                    await send_json(writer, 200, self.health())
+                elif path != '/render':
+                    raise RequestError(404, f"No route for {path}")
+                elif method != 'POST':
+                    raise RequestError(405, "Use POST /render")
+                else:
+                    start = time.perf_counter()
+                    config, audio_format = parse_render_request(
+                        body, self.max_bars)
+                    data = await self.render(config, audio_format)
+                    await send_audio(
+                        writer, data, CONTENT_TYPES[audio_format],
+                        {'X-Render-Seconds':
+                         f"{time.perf_counter() - start:.3f}"})
+            except RequestError as e:
+                headers = {}
+                if e.status == 503:
+                    headers['Retry-After'] = '1'
+                await send_json(writer, e.status, {'error': str(e)}, headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                raise
+            except Exception as e:
+                await send_json(writer, 500, {
+                    'error': f"Internal error: {type(e).__name__}: {e}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+async def read_request(reader: asyncio.StreamReader
+                       ) -> Tuple[str, str, bytes]:
+    """Read the request line, headers and Content-Length body"""
+    request_line = (await reader.readline()).decode('latin-1').split()
+    if len(request_line) != 3:
+        raise RequestError(400, "Malformed request line")
+    method, target, _ = request_line
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        raise RequestError(400, "Malformed Content-Length")
+    if length < 0:
+        raise RequestError(400, "Negative Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, f"Body over {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target.split('?')[0], body
+
+
+async def send_response_head(writer: asyncio.StreamWriter, status: int,
+                             content_type: str, length: int,
+                             headers: Optional[dict] = None) -> None:
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+             f"Content-Type: {content_type}",
+             f"Content-Length: {length}",
+             "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+
+async def send_json(writer: asyncio.StreamWriter, status: int,
+                    payload: dict, headers: Optional[dict] = None) -> None:
+    body = json.dumps(payload).encode()
+    await send_response_head(
+        writer, status, 'application/json', len(body), headers)
+    writer.write(body)
+    await writer.drain()
+
+
+async def send_audio(writer: asyncio.StreamWriter, data: bytes,
+                     content_type: str,
+                     headers: Optional[dict] = None) -> None:
+    """Write encoded audio in chunks, waiting on slow clients (drain)"""
+    await send_response_head(
+        writer, 200, content_type, len(data), headers)
+    view = memoryview(data)
+    for start in range(0, len(view), RESPONSE_CHUNK_BYTES):
+        writer.write(view[start:start + RESPONSE_CHUNK_BYTES])
+        await writer.drain()
+
+
+async def serve(host: str, port: int, service: RenderService) -> None:
+    service.start()
+    await service.warm_up()
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Render service on http://{host}:{port} "
+          f"({service.workers} workers, max {service.max_pending} pending)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+
+
+def main() -> None:
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Serve backing track renders over HTTP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Render processes (default: CPU count)')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='Distinct renders queued before 503 '
+                             '(default: 4 per worker)')
+    parser.add_argument('--timeout', type=float, default=120.0,
+                        help='Seconds a request waits for its render')
+    parser.add_argument('--max-bars', type=int, default=256,
+                        help='Largest bars value accepted')
+    parser.add_argument('--buffer-dir', default=None,
+                        help='Memory-map render buffers in this directory')
+
+    args = parser.parse_args()
+
+    service = RenderService(args.workers, args.max_pending, args.timeout,
+                            args.max_bars, args.buffer_dir)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()